@@ -0,0 +1,254 @@
+import hashlib
+import inspect
+import itertools
+import sqlite3
+
+from PDA import PDA
+
+
+# the methods whose results the cache stores; anything else is covered by GRAMMAR_VERSION
+GRAMMAR_METHODS = ('_tokenize', '_tokenize_postfix', 'infix_to_postfix', 'recognize_postfix', 'recognize_infix')
+
+
+def grammar_owner(pda_cls=PDA):
+    """The class that defines the grammar of `pda_cls`: the nearest one declaring `GRAMMAR_VERSION`.
+
+    Subclasses that only add counters or caches (and call super()) share the store of the
+    class they instrument; a subclass that changes results declares its own `GRAMMAR_VERSION`.
+    """
+    return next(cls for cls in pda_cls.__mro__ if 'GRAMMAR_VERSION' in vars(cls))
+
+
+def grammar_fingerprint(pda_cls=PDA):
+    """Return a digest identifying the tokenizer/grammar that produced cached results.
+
+    Built from `GRAMMAR_VERSION` and the source of each method in `GRAMMAR_METHODS` as
+    resolved on `grammar_owner(pda_cls)`, so editing one of those methods invalidates old
+    entries while docstrings or unrelated methods elsewhere do not.
+    """
+    owner = grammar_owner(pda_cls)
+    h = hashlib.sha256()
+    h.update(str(owner.GRAMMAR_VERSION).encode('utf-8'))
+    for name in GRAMMAR_METHODS:
+        func = getattr(owner, name)
+        try:
+            src = inspect.getsource(func).encode('utf-8')
+        except (OSError, TypeError):
+            src = code_digest(func.__code__)
+        h.update(b'\0')
+        h.update(func.__qualname__.encode('utf-8'))
+        h.update(src)
+    return h.hexdigest()
+
+
+def code_digest(code):
+    """Digest of a code object built only from data that is stable across processes.
+
+    Used when the source is unavailable (pyc-only installs, zipapps, frozen builds):
+    `repr(co_consts)` would embed the addresses of nested code objects, so those are
+    replaced by their own digest, and frozensets are hashed in sorted order.
+    """
+    h = hashlib.sha256()
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode('utf-8'))
+    for const in code.co_consts:
+        h.update(b'\0')
+        h.update(_const_digest(const))
+    return h.digest()
+
+
+def _const_digest(const):
+    if hasattr(const, 'co_code'):
+        return code_digest(const)
+    if isinstance(const, (tuple, frozenset)):
+        parts = [_const_digest(item) for item in const]
+        if isinstance(const, frozenset):
+            parts.sort()
+        return hashlib.sha256(type(const).__name__.encode('utf-8') + b'\0'.join(parts)).digest()
+    return repr(const).encode('utf-8')
+
+
+def expression_key(expr):
+    """Content hash of an infix expression (used as the cache key)."""
+    return hashlib.sha256(expr.encode('utf-8')).digest()
+
+
+class ConversionCache:
+    """Persistent SQLite cache of `PDA.infix_to_postfix` results.
+
+    Each entry maps the content hash of an infix expression to its postfix string
+    (None when the conversion raised ValueError) and its `recognize_infix` verdict.
+
+    - `get_many(exprs)` : bulk lookup, returns {expr: (postfix, verdict)} for hits
+    - `put_many(items)` : batched insert of (expr, postfix, verdict) in one transaction
+    - `convert_many(exprs)` : look up, convert only the misses, store them, return results in order
+    - `convert_iter(exprs)` : streaming form of convert_many for corpora that do not fit in memory
+    - `max_entries` : when exceeded, the least recently used entries are evicted
+
+    Recency is tracked per run, not per hit: each opened cache is a new generation, and a hit
+    only rewrites its row when it was last used `touch_interval` or more generations ago. So a
+    warm run over mostly unchanged input writes at most once per row every `touch_interval` runs,
+    and eviction removes entries from the oldest generations first.
+
+    The whole store is cleared automatically when `grammar_fingerprint()` changes.
+    A ConversionCache holds one sqlite3 connection; use one instance per thread.
+    """
+
+    LOOKUP_CHUNK = 500
+    # bump when the table layout or the meaning of a column changes
+    SCHEMA_VERSION = 2
+
+    def __init__(self, path, max_entries=None, batch_size=10000, pda=None, touch_interval=8):
+        self.path = path
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.touch_interval = touch_interval
+        self.pda = pda or PDA()
+        self.fingerprint = grammar_fingerprint(type(self.pda))
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._init_schema()
+        # exact row count, kept up to date by _write so eviction never needs COUNT(*) scans
+        self._count = len(self) if max_entries is not None else None
+
+    def _init_schema(self):
+        with self.conn:
+            self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS conversions ('
+                ' key BLOB PRIMARY KEY,'
+                ' postfix TEXT,'
+                ' verdict INTEGER NOT NULL,'
+                ' used REAL NOT NULL)'
+            )
+            self.conn.execute('CREATE INDEX IF NOT EXISTS conversions_used ON conversions (used)')
+            stamp = '{}:{}'.format(self.SCHEMA_VERSION, self.fingerprint)
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'grammar'").fetchone()
+            if row is None or row[0] != stamp:
+                # tokenizer, grammar or layout changed: every stored result is stale
+                self.conn.execute('DELETE FROM conversions')
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('grammar', ?)", (stamp,))
+            # `used` holds the generation (run number) that last read or wrote the row
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+            self.generation = int(row[0]) + 1 if row else 1
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('generation', ?)",
+                              (str(self.generation),))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM conversions').fetchone()[0]
+
+    def get_many(self, exprs):
+        """Bulk lookup. Returns {expr: (postfix, verdict)} for every cached expression."""
+        by_key = {}
+        for expr in exprs:
+            by_key.setdefault(expression_key(expr), expr)
+        keys = list(by_key)
+        found = {}
+        stale = self.generation - self.touch_interval
+        with self.conn:
+            for start in range(0, len(keys), self.LOOKUP_CHUNK):
+                chunk = keys[start:start + self.LOOKUP_CHUNK]
+                marks = ','.join('?' * len(chunk))
+                rows = self.conn.execute(
+                    'SELECT key, postfix, verdict, used FROM conversions WHERE key IN ({})'.format(marks), chunk
+                ).fetchall()
+                for key, postfix, verdict, used in rows:
+                    found[by_key[key]] = (postfix, bool(verdict))
+                if self.max_entries is not None:
+                    # recency only matters when eviction is enabled; rows touched recently are left alone
+                    touch = [(self.generation, key) for key, _, _, used in rows if used <= stale]
+                    if touch:
+                        self.conn.executemany('UPDATE conversions SET used = ? WHERE key = ?', touch)
+        return found
+
+    def put_many(self, items):
+        """Store (expr, postfix, verdict) triples, `batch_size` rows per transaction."""
+        batch = []
+        for expr, postfix, verdict in items:
+            batch.append((expression_key(expr), postfix, int(bool(verdict)), self.generation))
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def _write(self, rows):
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO conversions (key, postfix, verdict, used) VALUES (?, ?, ?, ?)', rows
+            )
+            inserted = self.conn.total_changes - before
+            if inserted < len(rows):
+                # some keys already existed: overwrite them (not the common path for convert_many)
+                self.conn.executemany(
+                    'UPDATE conversions SET postfix = ?, verdict = ?, used = ? WHERE key = ?',
+                    [(postfix, verdict, used, key) for key, postfix, verdict, used in rows]
+                )
+            self._evict(inserted)
+
+    def _evict(self, inserted):
+        if self.max_entries is None:
+            return
+        self._count += inserted
+        excess = self._count - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                'DELETE FROM conversions WHERE key IN (SELECT key FROM conversions ORDER BY used LIMIT ?)',
+                (excess,)
+            )
+            self._count = self.max_entries
+
+    def convert(self, expr):
+        """Return (postfix, verdict) for one expression, converting it on a miss."""
+        return self.convert_many([expr])[0]
+
+    def convert_many(self, exprs):
+        """Return [(postfix, verdict), ...] in input order, parsing only uncached expressions."""
+        exprs = list(exprs)
+        results = self.get_many(exprs)
+        misses = []
+        for expr in exprs:
+            if expr in results:
+                continue
+            try:
+                postfix = self.pda.infix_to_postfix(expr)
+            except ValueError:
+                postfix = None
+            verdict = postfix is not None and self.pda.recognize_postfix(postfix)
+            results[expr] = (postfix, verdict)
+            misses.append((expr, postfix, verdict))
+        if misses:
+            self.put_many(misses)
+        return [results[expr] for expr in exprs]
+
+    def convert_iter(self, exprs, chunk_size=None):
+        """Yield (expr, postfix, verdict) for an iterable of expressions, in input order.
+
+        Input is consumed `chunk_size` (default `batch_size`) expressions at a time, so memory
+        does not grow with the corpus; each chunk is one bulk lookup plus one batched write.
+        """
+        chunk_size = chunk_size or self.batch_size
+        exprs = iter(exprs)
+        while True:
+            chunk = list(itertools.islice(exprs, chunk_size))
+            if not chunk:
+                return
+            for expr, (postfix, verdict) in zip(chunk, self.convert_many(chunk)):
+                yield expr, postfix, verdict
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute('DELETE FROM conversions')
+        if self._count is not None:
+            self._count = 0
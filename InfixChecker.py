@@ -3,13 +3,24 @@ InfixChecker.py - Kiem tra bieu thuc trung to voi hien thi tung buoc
 Chuyen tu trung to (infix) sang hau to (postfix) va kiem tra tinh hop le
 """
 
-from PDA import PDA
+import io
+import sys
+
+from PDA import OUTPUT_LOCK, PDA
 
 
 class InfixChecker:
-    def __init__(self):
+    """Kiem tra bieu thuc trung to, in bao cao tung buoc ra `out` (mac dinh sys.stdout).
+
+    Thread safety: an instance holds no per-call state, so one checker may be shared
+    by many threads. Each report is rendered into a private buffer and written to
+    `out` in a single call under `OUTPUT_LOCK` (shared with PostfixChecker), so concurrent
+    reports do not interleave.
+    """
+
+    def __init__(self, out=None):
         self.pda = PDA()
-        self.steps = []
+        self.out = out
 
     def check_infix(self, expr):
         """
@@ -18,64 +29,71 @@ class InfixChecker:
         2. Chuyen sang hau to (shunting-yard)
         3. Kiem tra hau to bang PDA
         """
-        print(f"\n{'=' * 70}")
-        print(f"KIEM TRA BIEU THUC TRUNG TO (INFIX)")
-        print(f"{'=' * 70}")
-        print(f"Bieu thuc nhap vao: {expr}")
-        print()
+        buf = io.StringIO()
+        result = self._render_check(expr, buf)
+        with OUTPUT_LOCK:
+            (self.out or sys.stdout).write(buf.getvalue())
+        return result
+
+    def _render_check(self, expr, out):
+        print(f"\n{'=' * 70}", file=out)
+        print(f"KIEM TRA BIEU THUC TRUNG TO (INFIX)", file=out)
+        print(f"{'=' * 70}", file=out)
+        print(f"Bieu thuc nhap vao: {expr}", file=out)
+        print(file=out)
 
         # Buoc 1: Tokenize
-        print(f"{'-' * 70}")
-        print("BUOC 1: PHAN TICH TOKENS")
-        print(f"{'-' * 70}")
+        print(f"{'-' * 70}", file=out)
+        print("BUOC 1: PHAN TICH TOKENS", file=out)
+        print(f"{'-' * 70}", file=out)
         tokens = self.pda._tokenize(expr)
-        print(f"Tokens: {tokens}")
-        print()
+        print(f"Tokens: {tokens}", file=out)
+        print(file=out)
 
         # Buoc 2: Chuyen sang hau to bang shunting-yard
-        print(f"{'-' * 70}")
-        print("BUOC 2: CHUYEN SANG HAU TO (SHUNTING-YARD)")
-        print(f"{'-' * 70}")
+        print(f"{'-' * 70}", file=out)
+        print("BUOC 2: CHUYEN SANG HAU TO (SHUNTING-YARD)", file=out)
+        print(f"{'-' * 70}", file=out)
         try:
             postfix = self.pda.infix_to_postfix(expr)
-            print(f"Hau to: {postfix}")
-            print(f"[OK] Chuyen doi thanh cong")
-            print()
+            print(f"Hau to: {postfix}", file=out)
+            print(f"[OK] Chuyen doi thanh cong", file=out)
+            print(file=out)
 
             # Buoc 3: Kiem tra hau to bang PDA
-            print(f"{'-' * 70}")
-            print("BUOC 3: KIEM TRA HAU TO BANG PDA")
-            print(f"{'-' * 70}")
-            self._show_postfix_recognition(postfix)
-            print()
+            print(f"{'-' * 70}", file=out)
+            print("BUOC 3: KIEM TRA HAU TO BANG PDA", file=out)
+            print(f"{'-' * 70}", file=out)
+            self._show_postfix_recognition(postfix, out)
+            print(file=out)
 
             # Ket qua cuoi cung
-            print(f"{'-' * 70}")
-            print("KET QUA CUOI CUNG")
-            print(f"{'-' * 70}")
+            print(f"{'-' * 70}", file=out)
+            print("KET QUA CUOI CUNG", file=out)
+            print(f"{'-' * 70}", file=out)
             result = self.pda.recognize_infix(expr)
             if result:
-                print(f"[OK] CHAP NHAN: Bieu thuc trung to '{expr}' hop le")
+                print(f"[OK] CHAP NHAN: Bieu thuc trung to '{expr}' hop le", file=out)
             else:
-                print(f"[NO] TU CHOI: Bieu thuc trung to '{expr}' khong hop le")
-            print(f"{'=' * 70}\n")
+                print(f"[NO] TU CHOI: Bieu thuc trung to '{expr}' khong hop le", file=out)
+            print(f"{'=' * 70}\n", file=out)
             return result
 
         except ValueError as e:
-            print(f"[ERROR] {e}")
-            print(f"{'=' * 70}\n")
+            print(f"[ERROR] {e}", file=out)
+            print(f"{'=' * 70}\n", file=out)
             return False
 
-    def _show_postfix_recognition(self, postfix_expr):
+    def _show_postfix_recognition(self, postfix_expr, out):
         """Hien thi qua trinh nhan dien hau to bang PDA"""
-        tokens = self.pda._tokenize(postfix_expr)
+        tokens = self.pda._tokenize_postfix(postfix_expr)
         stack = []
         operators = set(['+', '-', '*', '/', '^', '**'])
         functions = set(['sin', 'cos', 'tan', 'log', 'ln', 'sqrt', 'abs'])
         unary_ops = set(['u-'])
 
-        print(f"{'BUOC':<8} {'TOKEN':<10} {'HANH DONG':<20} {'STACK':<30} {'TRANG THAI':<15}")
-        print(f"{'-' * 83}")
+        print(f"{'BUOC':<8} {'TOKEN':<10} {'HANH DONG':<20} {'STACK':<30} {'TRANG THAI':<15}", file=out)
+        print(f"{'-' * 83}", file=out)
 
         step = 0
         for tok in tokens:
@@ -88,8 +106,8 @@ class InfixChecker:
 
             if tok in operators:
                 if len(stack) < 2:
-                    print(f"{step:<8} {tok:<10} {'POP 2, PUSH 1':<20} {str(stack):<30} {'LOI':<15}")
-                    print(f"[ERROR] Khong du toan hang cho toan tu '{tok}'")
+                    print(f"{step:<8} {tok:<10} {'POP 2, PUSH 1':<20} {str(stack):<30} {'LOI':<15}", file=out)
+                    print(f"[ERROR] Khong du toan hang cho toan tu '{tok}'", file=out)
                     return False
                 stack.pop()
                 stack.pop()
@@ -98,29 +116,33 @@ class InfixChecker:
                 status = "OK"
             elif tok in unary_ops or tok in functions:
                 if len(stack) < 1:
-                    print(f"{step:<8} {tok:<10} {'POP 1, PUSH 1':<20} {str(stack):<30} {'LOI':<15}")
-                    print(f"[ERROR] Khong du toan hang cho ham/toan tu don '{tok}'")
+                    print(f"{step:<8} {tok:<10} {'POP 1, PUSH 1':<20} {str(stack):<30} {'LOI':<15}", file=out)
+                    print(f"[ERROR] Khong du toan hang cho ham/toan tu don '{tok}'", file=out)
                     return False
                 stack.pop()
                 stack.append('R')
                 action = "POP 1, PUSH 1"
                 status = "OK"
+            elif not (tok.replace('.', '', 1).lstrip('-').isdigit() or tok.isalnum()):
+                print(f"{step:<8} {tok:<10} {'KY HIEU LA':<20} {str(stack):<30} {'LOI':<15}", file=out)
+                print(f"[ERROR] Ky hieu '{tok}' khong phai toan hang hay toan tu duoc ho tro", file=out)
+                return False
             else:
                 # Operand
                 stack.append('O')
                 action = "PUSH OPERAND"
                 status = "OK"
 
-            print(f"{step:<8} {tok:<10} {action:<20} {str(stack):<30} {status:<15}")
+            print(f"{step:<8} {tok:<10} {action:<20} {str(stack):<30} {status:<15}", file=out)
 
-        print(f"{'-' * 83}")
+        print(f"{'-' * 83}", file=out)
 
         # Kiem tra trang thai cuoi
         if len(stack) == 1:
-            print(f"[OK] Stack cuoi cung co 1 phan tu: CHAP NHAN")
+            print(f"[OK] Stack cuoi cung co 1 phan tu: CHAP NHAN", file=out)
             return True
         else:
-            print(f"[NO] Stack cuoi cung co {len(stack)} phan tu: TU CHOI")
+            print(f"[NO] Stack cuoi cung co {len(stack)} phan tu: TU CHOI", file=out)
             return False
 
 
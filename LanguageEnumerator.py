@@ -0,0 +1,213 @@
+"""
+LanguageEnumerator.py - Liet ke cac chuoi duoc chap nhan boi automata legacy
+Dung mo hinh di chuyen cua `PDA.compute_legacy` tren automata doc tu FileHandler.parseFile
+"""
+
+import time
+from collections import deque
+
+from PDA import PDA
+
+
+class EnumerationStats:
+    """Counters for one enumeration/search run."""
+
+    def __init__(self):
+        self.explored = 0
+        self.accepted = 0
+        self.pruned = 0
+        self.elapsed = 0.0
+        self.stopped = None
+
+    @property
+    def rate(self):
+        """Strings explored per second."""
+        return self.explored / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self):
+        text = 'explored {} strings in {:.3f}s ({:.0f}/s), accepted {}, pruned {}'.format(
+            self.explored, self.elapsed, self.rate, self.accepted, self.pruned)
+        if self.stopped:
+            text += ', stopped: {}'.format(self.stopped)
+        return text
+
+
+class LanguageEnumerator:
+    """Enumerate strings accepted by a legacy automaton (the dict returned by `FileHandler.parseFile`).
+
+    Acceptance follows `PDA.compute_legacy` exactly: every input character takes the first
+    matching production (or leaves the configuration unchanged), an end marker 'e' is fed
+    last, and the string is accepted when the final state is in `final_states`.
+
+    - `enumerate(max_length)` : accepted strings in order of length (file order within a length)
+    - `shortest_witness()` : the shortest accepted string, or None
+
+    Limits: configurations whose stack grows beyond `max_stack_depth` are pruned, and a run
+    stops early after `max_explored` strings or `time_limit` seconds. Memoized transitions and
+    configurations are capped at `max_configs` entries and the enumeration frontier at
+    `max_frontier` prefixes, so memory stays bounded.
+    Counters for the last run are in `self.stats`.
+    """
+
+    def __init__(self, parsedLines, max_stack_depth=64, max_explored=None, time_limit=None, max_configs=100000,
+                 max_frontier=1000000):
+        self.alphabet = [sym for sym in parsedLines['input_symbols'] if sym != 'e']
+        self.final_states = set(parsedLines['final_states'])
+        self.initial = (parsedLines['initial_state'], (parsedLines['initial_stack'],))
+        self.transitions = PDA.legacy_transitions(parsedLines['productions'])
+        self.max_stack_depth = max_stack_depth
+        self.max_explored = max_explored
+        self.time_limit = time_limit
+        self.max_configs = max_configs
+        self.max_frontier = max_frontier
+        self._moves = {}
+        self.stats = EnumerationStats()
+
+    def _move(self, config, chars):
+        state, stack = config
+        for char in chars:
+            move = self.transitions.get((state, char, stack[-1]))
+            if move is None:
+                continue
+            state, action = move
+            if action == 'e':
+                if len(stack) > 1:
+                    stack = stack[:-1]
+            else:
+                stack = stack + tuple(action)
+        return state, stack
+
+    def _step(self, config, sym):
+        """Configuration after reading `sym`, or None when it exceeds the stack-depth limit."""
+        key = (config, sym)
+        nxt = self._moves.get(key, key)
+        if nxt is key:
+            nxt = self._move(config, sym)
+            if len(nxt[1]) > self.max_stack_depth:
+                nxt = None
+            if len(self._moves) < self.max_configs:
+                self._moves[key] = nxt
+        return nxt
+
+    def _accepts(self, config):
+        return self._move(config, 'e')[0] in self.final_states
+
+    def _start(self):
+        self.stats = EnumerationStats()
+        self._started = time.perf_counter()
+
+    def _should_stop(self):
+        stats = self.stats
+        if stats.stopped:
+            return True
+        if self.max_explored is not None and stats.explored >= self.max_explored:
+            stats.stopped = 'max_explored'
+        elif self.time_limit is not None and stats.explored % 1024 == 0 \
+                and time.perf_counter() - self._started >= self.time_limit:
+            stats.stopped = 'time_limit'
+        return stats.stopped is not None
+
+    def _finish(self):
+        self.stats.elapsed = time.perf_counter() - self._started
+
+    def accepts(self, inputString):
+        """True when `inputString` is accepted (same verdict as `PDA.compute_legacy`, without printing)."""
+        return self._accepts(self._move(self.initial, inputString))
+
+    def enumerate(self, max_length, limit=None):
+        """Yield accepted strings of length 0..`max_length` in order of length.
+
+        One level-by-level breadth-first pass: the frontier holds (prefix, configuration) pairs
+        in order, so each prefix is extended exactly once and no recursion is involved.
+        Transitions and acceptance are memoized per configuration, so prefixes that reach the
+        same configuration share the work. The frontier is capped at `max_frontier` pairs;
+        when a level would exceed it, that level is finished and the run stops.
+        Stops after `limit` results if given.
+        """
+        self._start()
+        accepting = {}
+        frontier = [('', self.initial)]
+        truncated = False
+        try:
+            for length in range(max_length + 1):
+                expand = length < max_length
+                next_frontier = []
+                for prefix, config in frontier:
+                    if self._should_stop():
+                        return
+                    self.stats.explored += 1
+                    accepted = accepting.get(config)
+                    if accepted is None:
+                        accepted = self._accepts(config)
+                        if len(accepting) < self.max_configs:
+                            accepting[config] = accepted
+                    if accepted:
+                        self.stats.accepted += 1
+                        yield prefix
+                        if limit is not None and self.stats.accepted >= limit:
+                            self.stats.stopped = 'limit'
+                            return
+                    if not expand:
+                        continue
+                    for sym in self.alphabet:
+                        nxt = self._step(config, sym)
+                        if nxt is None:
+                            self.stats.pruned += 1
+                        elif len(next_frontier) < self.max_frontier:
+                            next_frontier.append((prefix + sym, nxt))
+                        else:
+                            # finish yielding this level, then stop
+                            expand = False
+                            truncated = True
+                            break
+                if truncated:
+                    self.stats.stopped = 'max_frontier'
+                if self.stats.stopped:
+                    return
+                frontier = next_frontier
+                if not frontier:
+                    return
+        finally:
+            self._finish()
+
+    def shortest_witness(self, max_length=None):
+        """Return the shortest accepted string (first in file order among equals), or None.
+
+        Breadth-first search over configurations; each configuration is visited once, so the
+        search ends when the reachable configurations (bounded by `max_stack_depth`) run out,
+        or earlier on `max_length`, `max_configs`, `max_explored` or `time_limit`.
+        """
+        self._start()
+        parents = {self.initial: None}
+        queue = deque([(self.initial, 0)])
+        try:
+            while queue:
+                if self._should_stop():
+                    return None
+                config, length = queue.popleft()
+                self.stats.explored += 1
+                if self._accepts(config):
+                    self.stats.accepted += 1
+                    return self._witness(parents, config)
+                if max_length is not None and length >= max_length:
+                    continue
+                for sym in self.alphabet:
+                    nxt = self._step(config, sym)
+                    if nxt is None:
+                        self.stats.pruned += 1
+                    elif nxt not in parents:
+                        if len(parents) >= self.max_configs:
+                            self.stats.stopped = 'max_configs'
+                            return None
+                        parents[nxt] = (config, sym)
+                        queue.append((nxt, length + 1))
+            return None
+        finally:
+            self._finish()
+
+    def _witness(self, parents, config):
+        symbols = []
+        while parents[config] is not None:
+            config, sym = parents[config]
+            symbols.append(sym)
+        return ''.join(reversed(symbols))
@@ -1,7 +1,11 @@
-from FileHandler import FileHandler
-import argparse
+# argparse and FileHandler are imported lazily in main(): one-shot checks stay cheap to start
+import _thread
 import sys
 
+# held while a checker writes a whole report, shared by InfixChecker and PostfixChecker so reports
+# to the same stream never interleave (the builtin _thread avoids importing threading at startup)
+OUTPUT_LOCK = _thread.allocate_lock()
+
 
 class PDA:
     """Pushdown-related utilities focused on infix/postfix expressions.
@@ -10,9 +14,20 @@ class PDA:
     - `infix_to_postfix(expr)` : convert infix expression to postfix (shunting-yard)
     - `recognize_postfix(expr)` : simulate a simple PDA that accepts well-formed postfix arithmetic expressions
     - `recognize_infix(expr)` : convert infix to postfix then recognize
+    - `recognize_batch(exprs)` : recognize many expressions concurrently on a thread pool
     - `compute_legacy(inputString, parsedLines)` : preserved basic legacy behavior for automata files
+
+    Thread safety: a PDA instance is immutable after construction and every method keeps
+    its working state (token list, stack, output) in locals, so a single instance may be
+    shared by any number of threads, including on free-threaded builds. `compute_legacy`
+    is also reentrant but prints its trace to stdout, so concurrent traces interleave.
+    Subclasses that add caches or counters must keep this contract.
     """
 
+    # bump when tokenizer/grammar semantics change (invalidates ConversionCache stores);
+    # subclasses that change results declare their own, instrumentation subclasses do not
+    GRAMMAR_VERSION = 1
+
     def __init__(self):
         pass
 
@@ -83,11 +98,22 @@ class PDA:
 
         return tokens
 
+    def _tokenize_postfix(self, expr):
+        """Tokenize a space-separated postfix expression.
+
+        Each whitespace-separated chunk is tokenized on its own, so a chunk such as '-3'
+        is always the negative literal (in postfix it follows an operand, which `_tokenize`
+        would otherwise read as a binary minus).
+        """
+        return [tok for chunk in expr.split() for tok in self._tokenize(chunk)]
+
     def infix_to_postfix(self, expr):
         """Convert infix expression to postfix using the shunting-yard algorithm.
 
         Supports multi-character operands (letters/digits/period), operators + - * / ^ and parentheses.
         Returns a space-separated postfix string.
+        Raises ValueError on mismatched parentheses, a missing operand or operator,
+        or a function name not followed by '('.
         """
         output = []
         stack = []
@@ -99,24 +125,35 @@ class PDA:
         functions = set(['sin', 'cos', 'tan', 'log', 'ln', 'sqrt', 'abs'])
 
         for tok in tokens:
+            if prev_token == 'func' and tok != '(':
+                raise ValueError('Function must be followed by "("')
+
             # functions should be recognized before generic alphanumeric operands
             if tok in functions:
+                if prev_token == 'operand':
+                    raise ValueError('Missing operator before function')
                 stack.append(tok)
                 prev_token = 'func'
                 continue
 
             # operand: number or variable (may contain digits or letters)
             if (tok.replace('.', '', 1).lstrip('-').isdigit()) or tok.isalnum():
+                if prev_token == 'operand':
+                    raise ValueError('Missing operator between operands')
                 output.append(tok)
                 prev_token = 'operand'
                 continue
 
             if tok == '(':
+                if prev_token == 'operand':
+                    raise ValueError('Missing operator before "("')
                 stack.append(tok)
                 prev_token = '('
                 continue
 
             if tok == ')':
+                if prev_token != 'operand':
+                    raise ValueError('Missing operand before ")"')
                 while stack and stack[-1] != '(':
                     output.append(stack.pop())
                 if stack and stack[-1] == '(':
@@ -132,6 +169,8 @@ class PDA:
             # detect unary minus
             if tok == '-' and (prev_token is None or prev_token in ('operator', '(')):
                 tok = 'u-'
+            elif prev_token != 'operand':
+                raise ValueError('Missing operand before operator')
 
             # operator
             while stack and stack[-1] != '(' and (
@@ -142,6 +181,11 @@ class PDA:
             stack.append(tok)
             prev_token = 'operator'
 
+        if prev_token == 'func':
+            raise ValueError('Function must be followed by "("')
+        if prev_token == 'operator':
+            raise ValueError('Missing operand at end of expression')
+
         while stack:
             top = stack.pop()
             if top in ('(', ')'):
@@ -157,7 +201,7 @@ class PDA:
         At the end the stack should contain exactly one marker.
         Returns True if accepted, False otherwise.
         """
-        tokens = self._tokenize(expr)
+        tokens = self._tokenize_postfix(expr)
         stack = []
         # define binary operators and unary/function operators
         bin_ops = set(['+', '-', '*', '/', '^', '**'])
@@ -178,9 +222,12 @@ class PDA:
                     return False
                 stack.pop()
                 stack.append('R')
-            else:
+            elif tok.replace('.', '', 1).lstrip('-').isdigit() or tok.isalnum():
                 # operand (variable, number)
                 stack.append('O')
+            else:
+                # unknown symbol (e.g. '%', ',') is neither operand nor supported operator
+                return False
 
         return len(stack) == 1
 
@@ -191,6 +238,37 @@ class PDA:
             return False
         return self.recognize_postfix(postfix)
 
+    def recognize_batch(self, exprs, postfix=False, max_workers=None, chunk_size=256):
+        """Recognize a list of expressions on a thread pool sharing this instance.
+
+        Uses `recognize_postfix` when `postfix` is True, otherwise `recognize_infix`.
+        Work is submitted in chunks of `chunk_size` to keep per-task overhead low.
+        Returns a list of booleans in input order.
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be a positive integer, got {!r}'.format(chunk_size))
+        from concurrent.futures import ThreadPoolExecutor
+
+        exprs = list(exprs)
+        recognize = self.recognize_postfix if postfix else self.recognize_infix
+        chunks = [exprs[i:i + chunk_size] for i in range(0, len(exprs), chunk_size)]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            done = pool.map(lambda chunk: [recognize(expr) for expr in chunk], chunks)
+            return [ok for chunk in done for ok in chunk]
+
+    @staticmethod
+    def legacy_transitions(productions):
+        """Index legacy productions by (state, input symbol, stack top).
+
+        Mirrors the scan in `compute_legacy`: when several productions match, the first one wins.
+        Incomplete lines (fewer than 5 fields) are ignored.
+        """
+        transitions = {}
+        for production in productions:
+            if len(production) >= 5:
+                transitions.setdefault(tuple(production[:3]), (production[3], production[4]))
+        return transitions
+
     def compute_legacy(self, inputString, parsedLines):
         """Preserve a clearer version of the original compute using parsed automata description.
 
@@ -203,27 +281,23 @@ class PDA:
         stack.append(initStackSymbol)
         finalStates = parsedLines['final_states']
         currentState = parsedLines['initial_state']
-        productions = parsedLines['productions']
+        transitions = self.legacy_transitions(parsedLines['productions'])
 
         print('State\tInput\tStack\tMove')
         print('{}\t {}\t {}\t ({}, {})'.format(currentState, '_', initStackSymbol, initStackSymbol, stack))
 
         for char in inputString:
             currentStackSymbol = stack[-1] if stack else None
-            moved = False
-            for production in productions:
-                if ((production[0] == currentState) and (production[1] == char) and (production[2] == currentStackSymbol)):
-                    currentState = production[3]
-                    action = production[4]
-                    if action == 'e':
-                        if len(stack) > 1:
-                            stack.pop()
-                    else:
-                        # push symbols from action (if action contains symbols like 'AA' push individually)
-                        for s in action:
-                            stack.append(s)
-                    moved = True
-                    break
+            move = transitions.get((currentState, char, currentStackSymbol))
+            if move is not None:
+                currentState, action = move
+                if action == 'e':
+                    if len(stack) > 1:
+                        stack.pop()
+                else:
+                    # push symbols from action (if action contains symbols like 'AA' push individually)
+                    for s in action:
+                        stack.append(s)
             prevStackSymbol = currentStackSymbol
             currentStackSymbol = stack[-1] if stack else None
             print('{}\t {}\t {}\t ({}, {})'.format(currentState, char, prevStackSymbol, currentStackSymbol, stack))
@@ -236,12 +310,71 @@ class PDA:
             return False
 
 
-def main(argv=None):
-    pda = PDA()
-    fh = FileHandler()
+def _check_postfix(pda, expr):
+    ok = pda.recognize_postfix(expr)
+    if ok:
+        print('CHẤP NHẬN: Biểu thức hậu tố hợp lệ.')
+        return 0
+    else:
+        print('TỪ CHỐI: Biểu thức hậu tố không hợp lệ.')
+        return 1
+
+
+def _check_infix(pda, expr):
+    try:
+        postfix = pda.infix_to_postfix(expr)
+        print('Converted postfix:', postfix)
+    except ValueError as e:
+        print('Error: mismatched parentheses or invalid infix:', e)
+        return 1
+    ok = pda.recognize_postfix(postfix)
+    if ok:
+        print('CHẤP NHẬN: Biểu thức trung tố hợp lệ (qua chuyển sang hậu tố).')
+        return 0
+    else:
+        print('TỪ CHỐI: Biểu thức trung tố không hợp lệ (qua chuyển sang hậu tố).')
+        return 1
 
-    if argv is None:
-        argv = sys.argv[1:]
+
+_FAST_COMMANDS = {'--postfix': _check_postfix, '--infix': _check_infix}
+
+
+def _fast_main(argv):
+    """Handle the common one-shot `--postfix EXPR` / `--infix EXPR` call without argparse.
+
+    Returns None when argv is anything else, so the caller falls back to the full parser.
+    """
+    if len(argv) == 2:
+        flag, expr = argv
+    elif len(argv) == 1 and '=' in argv[0]:
+        flag, expr = argv[0].split('=', 1)
+    else:
+        return None
+    command = _FAST_COMMANDS.get(flag)
+    if command is None or expr.startswith('--'):
+        return None
+    return command(PDA(), expr)
+
+
+def _enumerate_legacy(parsedLines, args):
+    from LanguageEnumerator import LanguageEnumerator
+
+    enumerator = LanguageEnumerator(parsedLines, max_explored=args.limit)
+    if args.shortest:
+        witness = enumerator.shortest_witness(max_length=args.enumerate)
+        if witness is None:
+            print('No accepted string found.')
+        else:
+            print('Shortest accepted string:', witness or 'e')
+    else:
+        for word in enumerator.enumerate(args.enumerate):
+            print(word or 'e')
+    print(enumerator.stats)
+    return 0
+
+
+def _build_parser():
+    import argparse
 
     parser = argparse.ArgumentParser(description='PDA utilities: convert/check infix/postfix or run legacy automata file')
     group = parser.add_mutually_exclusive_group(required=True)
@@ -252,8 +385,29 @@ def main(argv=None):
 
     parser.add_argument('--file', type=str, help='Path to automata file (for --legacy)')
     parser.add_argument('--input', type=str, help='Input string for automata (for --legacy)')
+    parser.add_argument('--enumerate', type=int, metavar='MAXLEN',
+                        help='List accepted strings up to length MAXLEN (for --legacy)')
+    parser.add_argument('--shortest', action='store_true', help='Print the shortest accepted string (for --legacy)')
+    parser.add_argument('--limit', type=int, help='Stop after this many strings explored (for --enumerate/--shortest)')
+    return parser
+
 
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    status = _fast_main(argv)
+    if status is not None:
+        return status
+
+    pda = PDA()
+    parser = _build_parser()
     args = parser.parse_args(argv)
+    enumerating = args.enumerate is not None or args.shortest
+    if (enumerating or args.limit is not None) and not args.legacy:
+        parser.error('--enumerate, --shortest and --limit require --legacy')
+    if args.limit is not None and not enumerating:
+        parser.error('--limit requires --enumerate or --shortest')
 
     if args.convert:
         expr = args.infix
@@ -269,37 +423,25 @@ def main(argv=None):
             return 1
 
     if args.postfix is not None:
-        expr = args.postfix
-        ok = pda.recognize_postfix(expr)
-        if ok:
-            print('CHẤP NHẬN: Biểu thức hậu tố hợp lệ.')
-            return 0
-        else:
-            print('TỪ CHỐI: Biểu thức hậu tố không hợp lệ.')
-            return 1
+        return _check_postfix(pda, args.postfix)
 
     if args.infix is not None:
-        expr = args.infix
-        try:
-            postfix = pda.infix_to_postfix(expr)
-            print('Converted postfix:', postfix)
-        except ValueError as e:
-            print('Error: mismatched parentheses or invalid infix:', e)
-            return 1
-        ok = pda.recognize_postfix(postfix)
-        if ok:
-            print('CHẤP NHẬN: Biểu thức trung tố hợp lệ (qua chuyển sang hậu tố).')
-            return 0
-        else:
-            print('TỪ CHỐI: Biểu thức trung tố không hợp lệ (qua chuyển sang hậu tố).')
-            return 1
+        return _check_infix(pda, args.infix)
 
     if args.legacy:
         if not args.file:
-            print('Error: --legacy requires --file PATH and --input STRING')
+            if enumerating:
+                print('Error: --legacy --enumerate/--shortest requires --file PATH')
+            else:
+                print('Error: --legacy requires --file PATH and --input STRING')
             return 2
+        from FileHandler import FileHandler
+
+        fh = FileHandler()
         lines = fh.readFile(args.file)
         parsedLines = fh.parseFile(lines)
+        if enumerating:
+            return _enumerate_legacy(parsedLines, args)
         inputString = args.input or input('Enter input String: ')
         pda.compute_legacy(inputString, parsedLines)
         return 0
@@ -308,4 +450,4 @@ def main(argv=None):
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -3,12 +3,22 @@ PostfixChecker.py - Kiem tra bieu thuc hau to voi hien thi tung buoc
 Su dung PDA de nhan dien bieu thuc hau to (postfix)
 """
 
-from PDA import PDA
+import io
+import sys
+
+from PDA import OUTPUT_LOCK, PDA
 
 
 class PostfixChecker:
-    def __init__(self):
+    """Kiem tra bieu thuc hau to, in bao cao tung buoc ra `out` (mac dinh sys.stdout).
+
+    Thread safety: same contract as InfixChecker - no per-call state on the instance,
+    each report is buffered privately and written to `out` in one call under `OUTPUT_LOCK`.
+    """
+
+    def __init__(self, out=None):
         self.pda = PDA()
+        self.out = out
 
     def check_postfix(self, expr):
         """
@@ -16,39 +26,46 @@ class PostfixChecker:
         1. Parse/tokenize
         2. Mo phong PDA nhan dien hau to
         """
-        print(f"\n{'=' * 70}")
-        print(f"KIEM TRA BIEU THUC HAU TO (POSTFIX)")
-        print(f"{'=' * 70}")
-        print(f"Bieu thuc nhap vao: {expr}")
-        print()
+        buf = io.StringIO()
+        result = self._render_check(expr, buf)
+        with OUTPUT_LOCK:
+            (self.out or sys.stdout).write(buf.getvalue())
+        return result
+
+    def _render_check(self, expr, out):
+        print(f"\n{'=' * 70}", file=out)
+        print(f"KIEM TRA BIEU THUC HAU TO (POSTFIX)", file=out)
+        print(f"{'=' * 70}", file=out)
+        print(f"Bieu thuc nhap vao: {expr}", file=out)
+        print(file=out)
 
         # Buoc 1: Tokenize
-        print(f"{'-' * 70}")
-        print("BUOC 1: PHAN TICH TOKENS")
-        print(f"{'-' * 70}")
-        tokens = self.pda._tokenize(expr)
-        print(f"Tokens: {tokens}")
-        print()
+        print(f"{'-' * 70}", file=out)
+        print("BUOC 1: PHAN TICH TOKENS", file=out)
+        print(f"{'-' * 70}", file=out)
+        tokens = self.pda._tokenize_postfix(expr)
+        print(f"Tokens: {tokens}", file=out)
+        print(file=out)
 
         # Buoc 2: Mo phong PDA
-        print(f"{'-' * 70}")
-        print("BUOC 2: MO PHONG PDA NHAN DIEN")
-        print(f"{'-' * 70}")
-        result = self._simulate_pda(expr)
-        print()
+        print(f"{'-' * 70}", file=out)
+        print("BUOC 2: MO PHONG PDA NHAN DIEN", file=out)
+        print(f"{'-' * 70}", file=out)
+        result = self._simulate_pda(expr, out)
+        print(file=out)
 
         # Ket qua cuoi cung
-        print(f"{'-' * 70}")
-        print("KET QUA CUOI CUNG")
-        print(f"{'-' * 70}")
+        print(f"{'-' * 70}", file=out)
+        print("KET QUA CUOI CUNG", file=out)
+        print(f"{'-' * 70}", file=out)
         if result:
-            print(f"[OK] CHAP NHAN: Bieu thuc hau to '{expr}' hop le")
+            print(f"[OK] CHAP NHAN: Bieu thuc hau to '{expr}' hop le", file=out)
         else:
-            print(f"[NO] TU CHOI: Bieu thuc hau to '{expr}' khong hop le")
-        print(f"{'=' * 70}\n")
+            print(f"[NO] TU CHOI: Bieu thuc hau to '{expr}' khong hop le", file=out)
+        print(f"{'=' * 70}\n", file=out)
         return result
 
-    def _simulate_pda(self, postfix_expr):
+    def _simulate_pda(self, postfix_expr, out):
         """
         Mo phong PDA voi hien thi chi tiet tung buoc:
         - Operands: PUSH len stack
@@ -56,15 +73,15 @@ class PostfixChecker:
         - Unary operators/functions: POP 1, PUSH 1 result
         - Cuoi: stack phai chi co 1 phan tu (result)
         """
-        tokens = self.pda._tokenize(postfix_expr)
+        tokens = self.pda._tokenize_postfix(postfix_expr)
         stack = []
         operators = set(['+', '-', '*', '/', '^', '**'])
         functions = set(['sin', 'cos', 'tan', 'log', 'ln', 'sqrt', 'abs'])
         unary_ops = set(['u-'])
 
-        print(f"PDA STACK SIMULATION:")
-        print(f"{'BUOC':<8} {'TOKEN':<10} {'LOAI':<15} {'HANH DONG':<25} {'STACK':<35} {'TRANG THAI':<15}")
-        print(f"{'-' * 108}")
+        print(f"PDA STACK SIMULATION:", file=out)
+        print(f"{'BUOC':<8} {'TOKEN':<10} {'LOAI':<15} {'HANH DONG':<25} {'STACK':<35} {'TRANG THAI':<15}", file=out)
+        print(f"{'-' * 108}", file=out)
 
         step = 0
         for tok in tokens:
@@ -80,8 +97,8 @@ class PostfixChecker:
                 # Binary operator
                 tok_type = "Toan tu nhi phan"
                 if len(stack) < 2:
-                    print(f"{step:<8} {tok:<10} {tok_type:<15} {'LOI: thieu toan hang':<25} {str(stack):<35} {'LOI':<15}")
-                    print(f"\n[ERROR] Toan tu '{tok}' can 2 toan hang nhung stack chi co {len(stack)} phan tu")
+                    print(f"{step:<8} {tok:<10} {tok_type:<15} {'LOI: thieu toan hang':<25} {str(stack):<35} {'LOI':<15}", file=out)
+                    print(f"\n[ERROR] Toan tu '{tok}' can 2 toan hang nhung stack chi co {len(stack)} phan tu", file=out)
                     return False
                 operand2 = stack.pop()
                 operand1 = stack.pop()
@@ -93,8 +110,8 @@ class PostfixChecker:
                 # Unary operator
                 tok_type = "Toan tu don"
                 if len(stack) < 1:
-                    print(f"{step:<8} {tok:<10} {tok_type:<15} {'LOI: thieu toan hang':<25} {str(stack):<35} {'LOI':<15}")
-                    print(f"\n[ERROR] Toan tu don '{tok}' can 1 toan hang nhung stack trong")
+                    print(f"{step:<8} {tok:<10} {tok_type:<15} {'LOI: thieu toan hang':<25} {str(stack):<35} {'LOI':<15}", file=out)
+                    print(f"\n[ERROR] Toan tu don '{tok}' can 1 toan hang nhung stack trong", file=out)
                     return False
                 operand = stack.pop()
                 action = f"POP({operand}) -> PUSH(R)"
@@ -105,14 +122,20 @@ class PostfixChecker:
                 # Function
                 tok_type = "Ham"
                 if len(stack) < 1:
-                    print(f"{step:<8} {tok:<10} {tok_type:<15} {'LOI: thieu toan hang':<25} {str(stack):<35} {'LOI':<15}")
-                    print(f"\n[ERROR] Ham '{tok}' can 1 toan hang nhung stack trong")
+                    print(f"{step:<8} {tok:<10} {tok_type:<15} {'LOI: thieu toan hang':<25} {str(stack):<35} {'LOI':<15}", file=out)
+                    print(f"\n[ERROR] Ham '{tok}' can 1 toan hang nhung stack trong", file=out)
                     return False
                 operand = stack.pop()
                 action = f"POP({operand}) -> PUSH(R)"
                 stack.append('R')
                 status = "OK"
 
+            elif not (tok.replace('.', '', 1).lstrip('-').isdigit() or tok.isalnum()):
+                tok_type = "Ky hieu la"
+                print(f"{step:<8} {tok:<10} {tok_type:<15} {'LOI: khong ho tro':<25} {str(stack):<35} {'LOI':<15}", file=out)
+                print(f"\n[ERROR] Ky hieu '{tok}' khong phai toan hang hay toan tu duoc ho tro", file=out)
+                return False
+
             else:
                 # Operand (number or variable)
                 tok_type = "Toan hang"
@@ -120,20 +143,20 @@ class PostfixChecker:
                 stack.append(f"{tok}")
                 status = "OK"
 
-            print(f"{step:<8} {tok:<10} {tok_type:<15} {action:<25} {str(stack):<35} {status:<15}")
+            print(f"{step:<8} {tok:<10} {tok_type:<15} {action:<25} {str(stack):<35} {status:<15}", file=out)
 
-        print(f"{'-' * 108}")
+        print(f"{'-' * 108}", file=out)
 
         # Kiem tra stack cuoi cung
-        print(f"\nKiem tra trang thai cuoi cung:")
-        print(f"  - Stack: {stack}")
-        print(f"  - So phan tu: {len(stack)}")
+        print(f"\nKiem tra trang thai cuoi cung:", file=out)
+        print(f"  - Stack: {stack}", file=out)
+        print(f"  - So phan tu: {len(stack)}", file=out)
 
         if len(stack) == 1:
-            print(f"[OK] Stack co dung 1 phan tu (ket qua) -> CHAP NHAN")
+            print(f"[OK] Stack co dung 1 phan tu (ket qua) -> CHAP NHAN", file=out)
             return True
         else:
-            print(f"[NO] Stack co {len(stack)} phan tu (phai la 1) -> TU CHOI")
+            print(f"[NO] Stack co {len(stack)} phan tu (phai la 1) -> TU CHOI", file=out)
             return False
 
 
@@ -0,0 +1,96 @@
+"""
+bench_startup.py - Do thoi gian khoi dong cua cac cong cu dong lenh
+Dung `python -X importtime` de do thoi gian import tung module va do thoi gian
+chay mot lenh `PDA.py --postfix` hoan chinh.
+"""
+
+import compileall
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# cumulative import budget for the modules the one-shot CLI paths load, as a fraction of
+# the imports the interpreter itself does at startup (`python -c pass`, measured in the same run)
+IMPORT_BUDGET = {'PDA': 0.25, 'InfixChecker': 0.25, 'PostfixChecker': 0.25}
+RUNS = 5
+
+
+def import_times(module=None):
+    """Import `module` (nothing when None) in a fresh interpreter under -X importtime.
+
+    Returns {module name: (self_us, cumulative_us)} for every module that got imported.
+    """
+    code = 'import {}'.format(module) if module else 'pass'
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=HERE, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            # header line: "self [us] | cumulative | imported package"
+            continue
+        name = parts[2][1:].rstrip()
+        times[name] = (int(parts[0]), int(parts[1]))
+    return times
+
+
+def startup_import_us():
+    """Best-of-RUNS cumulative import time (us) of a bare interpreter start."""
+    best = None
+    for _ in range(RUNS):
+        times = import_times()
+        # top-level entries only: nested imports are already inside their parent's cumulative time
+        total = sum(cumulative for name, (_, cumulative) in times.items() if not name.startswith(' '))
+        best = total if best is None else min(best, total)
+    return best
+
+
+def module_import_us(module):
+    """Best-of-RUNS cumulative import time (us) of `module` on top of the interpreter start."""
+    return min(import_times(module)[module][1] for _ in range(RUNS))
+
+
+def cli_wall_time(args, runs=10):
+    """Best wall-clock time in seconds of `python PDA.py ARGS` over `runs` runs."""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, 'PDA.py'] + args, cwd=HERE, capture_output=True, check=False)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    # measure warm starts: a stale .pyc would add recompilation to every import
+    compileall.compile_dir(HERE, maxlevels=0, quiet=1)
+    baseline = startup_import_us()
+    print(f"Interpreter startup imports (python -c pass): {baseline} us")
+    print()
+    print(f"{'MODULE':<16} {'CUMULATIVE (us)':>16} {'BUDGET (us)':>12} {'TRANG THAI':>12}")
+    print(f"{'-' * 59}")
+    ok = True
+    for module, fraction in IMPORT_BUDGET.items():
+        cumulative = module_import_us(module)
+        budget = int(baseline * fraction)
+        status = 'OK' if cumulative <= budget else 'VUOT'
+        ok = ok and cumulative <= budget
+        print(f"{module:<16} {cumulative:>16} {budget:>12} {status:>12}")
+    print()
+
+    full = cli_wall_time(['--help'])
+    fast = cli_wall_time(['--postfix', 'a b + c *'])
+    print(f"PDA.py --help (argparse)        : {full * 1000:.2f} ms")
+    print(f"PDA.py --postfix (fast path)    : {fast * 1000:.2f} ms")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,377 @@
+"""
+fuzz_pda.py - Kiem thu fuzz vi sai (differential) cho tokenizer, bo chuyen doi va bo nhan dien
+Sinh ngau nhien bieu thuc trung to hop le / loi tu ngu phap va so sanh PDA voi:
+- mot bo phan tich de quy xuong (recursive-descent) tham chieu
+- mot bo danh gia hau to tham chieu (dung lai cay bieu thuc tu chuoi hau to)
+- (tuy chon) mot cai dat PDA "toi uu" so voi cai dat goc
+"""
+
+import argparse
+import importlib
+import random
+import re
+import sys
+import time
+
+from PDA import PDA
+
+FUNCTIONS = ('sin', 'cos', 'tan', 'log', 'ln', 'sqrt', 'abs')
+BINARY_OPS = ('+', '-', '*', '/', '^', '**')
+VARIABLES = ('a', 'b', 'c', 'x', 'y', 'z')
+
+# lexical rules of PDA._tokenize, written independently with regular expressions (ASCII input)
+_NUMBER = re.compile(r'\d+(?:\.\d*)?|\.\d+')
+_NEG_NUMBER = re.compile(r'-(?:\d+(?:\.\d*)?|\.\d*)')
+_IDENT = re.compile(r'[A-Za-z]+')
+_OPERAND = re.compile(r'-?(?:\d+(?:\.\d*)?|\.\d+)|[A-Za-z]+')
+_TWO_CHAR_OPS = ('**', '==', '!=', '<=', '>=', '&&', '||')
+# a '-' directly followed by a digit or '.' starts a negative literal after these tokens
+_NEG_PREV = {'+', '-', '*', '/', '^', '%', '(', ',', '**', '=', '<', '>', '!', '&', '|'}
+
+
+class ReferenceSyntaxError(ValueError):
+    pass
+
+
+def reference_tokenize(expr):
+    tokens = []
+    i = 0
+    n = len(expr)
+    while i < n:
+        if expr[i].isspace():
+            i += 1
+            continue
+        m = None
+        if expr[i] == '-' and (not tokens or tokens[-1] in _NEG_PREV):
+            m = _NEG_NUMBER.match(expr, i)
+        m = m or _NUMBER.match(expr, i) or _IDENT.match(expr, i)
+        if m:
+            tok = m.group()
+        elif expr[i:i + 2] in _TWO_CHAR_OPS:
+            tok = expr[i:i + 2]
+        else:
+            tok = expr[i]
+        tokens.append(tok)
+        i += len(tok)
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser for the infix grammar PDA is meant to accept:
+
+        expr    := term (('+' | '-') term)*
+        term    := factor (('*' | '/') factor)*
+        factor  := unary (('^' | '**') factor)?
+        unary   := '-' unary | primary
+        primary := NUMBER | VARIABLE | FUNCTION '(' expr ')' | '(' expr ')'
+
+    Trees: operand string, ('u-', t), (function, t) or (op, left, right).
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, expected=None):
+        tok = self.peek()
+        if tok is None or (expected is not None and tok != expected):
+            raise ReferenceSyntaxError('expected {!r} at token {}, got {!r}'.format(expected, self.pos, tok))
+        self.pos += 1
+        return tok
+
+    def parse(self):
+        tree = self.expr()
+        if self.peek() is not None:
+            raise ReferenceSyntaxError('unexpected {!r} at token {}'.format(self.peek(), self.pos))
+        return tree
+
+    def expr(self):
+        tree = self.term()
+        while self.peek() in ('+', '-'):
+            op = self.take()
+            tree = (op, tree, self.term())
+        return tree
+
+    def term(self):
+        tree = self.factor()
+        while self.peek() in ('*', '/'):
+            op = self.take()
+            tree = (op, tree, self.factor())
+        return tree
+
+    def factor(self):
+        tree = self.unary()
+        if self.peek() in ('^', '**'):
+            op = self.take()
+            tree = (op, tree, self.factor())
+        return tree
+
+    def unary(self):
+        if self.peek() == '-':
+            self.take()
+            return ('u-', self.unary())
+        return self.primary()
+
+    def primary(self):
+        tok = self.take()
+        if tok in FUNCTIONS:
+            self.take('(')
+            tree = (tok, self.expr())
+            self.take(')')
+            return tree
+        if tok == '(':
+            tree = self.expr()
+            self.take(')')
+            return tree
+        if _OPERAND.fullmatch(tok):
+            return tok
+        raise ReferenceSyntaxError('unexpected {!r} at token {}'.format(tok, self.pos - 1))
+
+
+def reference_parse(expr):
+    """Parse infix `expr` into a tree; raises ReferenceSyntaxError when it is not well formed."""
+    return _Parser(reference_tokenize(expr)).parse()
+
+
+def reference_recognize(expr):
+    try:
+        reference_parse(expr)
+    except ReferenceSyntaxError:
+        return False
+    return True
+
+
+def reference_postfix(tree):
+    """Postfix string PDA.infix_to_postfix is expected to produce for `tree`."""
+    if isinstance(tree, str):
+        return tree
+    if len(tree) == 2:
+        return '{} {}'.format(reference_postfix(tree[1]), tree[0])
+    return '{} {} {}'.format(reference_postfix(tree[1]), reference_postfix(tree[2]), tree[0])
+
+
+def reference_evaluate(postfix):
+    """Evaluate a space-separated postfix string back into a tree, or None when it is malformed."""
+    stack = []
+    for tok in postfix.split():
+        if tok in BINARY_OPS:
+            if len(stack) < 2:
+                return None
+            right = stack.pop()
+            stack.append((tok, stack.pop(), right))
+        elif tok == 'u-' or tok in FUNCTIONS:
+            if not stack:
+                return None
+            stack.append((tok, stack.pop()))
+        elif _OPERAND.fullmatch(tok):
+            stack.append(tok)
+        else:
+            return None
+    return stack[0] if len(stack) == 1 else None
+
+
+class ExpressionGenerator:
+    """Random infix expressions drawn from the reference grammar, plus mutated (mostly malformed) ones."""
+
+    NOISE = ('(', ')', '+', '-', '*', '/', '^', '**', '%', ',', '.', 'a', '3', '2.5', 'sin')
+
+    def __init__(self, seed=None, max_depth=4):
+        self.rng = random.Random(seed)
+        self.max_depth = max_depth
+
+    def number(self):
+        rng = self.rng
+        kind = rng.random()
+        if kind < 0.6:
+            return str(rng.randint(0, 999))
+        if kind < 0.8:
+            return '{}.{}'.format(rng.randint(0, 99), rng.randint(0, 99))
+        if kind < 0.9:
+            return '.{}'.format(rng.randint(0, 99))
+        return '{}.'.format(rng.randint(0, 99))
+
+    def expr(self, depth=0):
+        tokens = self.term(depth)
+        for _ in range(self.rng.randint(0, 2 if depth < self.max_depth else 0)):
+            tokens += [self.rng.choice(('+', '-'))] + self.term(depth + 1)
+        return tokens
+
+    def term(self, depth):
+        tokens = self.factor(depth)
+        for _ in range(self.rng.randint(0, 2 if depth < self.max_depth else 0)):
+            tokens += [self.rng.choice(('*', '/'))] + self.factor(depth + 1)
+        return tokens
+
+    def factor(self, depth):
+        tokens = self.unary(depth)
+        if depth < self.max_depth and self.rng.random() < 0.25:
+            tokens += [self.rng.choice(('^', '**'))] + self.factor(depth + 1)
+        return tokens
+
+    def unary(self, depth):
+        if self.rng.random() < 0.2:
+            return ['-'] + self.unary(depth)
+        return self.primary(depth)
+
+    def primary(self, depth):
+        rng = self.rng
+        choice = rng.random() if depth < self.max_depth else 0.0
+        if choice < 0.35:
+            return [self.number()]
+        if choice < 0.7:
+            return [rng.choice(VARIABLES)]
+        if choice < 0.85:
+            return [rng.choice(FUNCTIONS), '('] + self.expr(depth + 1) + [')']
+        return ['('] + self.expr(depth + 1) + [')']
+
+    def join(self, tokens):
+        return ''.join(tok + self.rng.choice(('', '', ' ')) for tok in tokens).strip()
+
+    def mutate(self, tokens):
+        tokens = list(tokens)
+        rng = self.rng
+        for _ in range(rng.randint(1, 2)):
+            i = rng.randrange(len(tokens) + 1)
+            kind = rng.random()
+            if kind < 0.3 and tokens:
+                del tokens[min(i, len(tokens) - 1)]
+            elif kind < 0.5 and tokens:
+                i = min(i, len(tokens) - 1)
+                tokens.insert(i, tokens[i])
+            elif kind < 0.8:
+                tokens.insert(i, rng.choice(self.NOISE))
+            elif len(tokens) > 1:
+                i = min(i, len(tokens) - 2)
+                tokens[i], tokens[i + 1] = tokens[i + 1], tokens[i]
+        return tokens
+
+    def well_formed(self):
+        return self.join(self.expr())
+
+    def malformed(self):
+        return self.join(self.mutate(self.expr()))
+
+    def postfix(self):
+        """A postfix string: either a correct conversion or a token-level mutation of one."""
+        tokens = reference_postfix(reference_parse(self.well_formed())).split()
+        if self.rng.random() < 0.5:
+            tokens = self.mutate(tokens)
+        return ' '.join(tokens)
+
+
+class FuzzReport:
+    def __init__(self):
+        self.cases = 0
+        self.failures = []
+        self.elapsed = 0.0
+
+    @property
+    def rate(self):
+        return self.cases / self.elapsed if self.elapsed > 0 else 0.0
+
+    def fail(self, check, case, expected, got):
+        self.failures.append((check, case, expected, got))
+
+    def __str__(self):
+        return '{} cases in {:.2f}s ({:.0f}/s), {} failures'.format(
+            self.cases, self.elapsed, self.rate, len(self.failures))
+
+
+def _outcome(func, *args):
+    """Return value of func(*args), or the exception type name when it raises ValueError."""
+    try:
+        return func(*args)
+    except ValueError as e:
+        return type(e).__name__
+
+
+def check_infix(pda, expr, report):
+    """recognize_infix agrees with the reference parser; accepted input round-trips through postfix."""
+    try:
+        tree = reference_parse(expr)
+    except ReferenceSyntaxError:
+        tree = None
+    got = pda.recognize_infix(expr)
+    if got != (tree is not None):
+        report.fail('recognize_infix', expr, tree is not None, got)
+        return
+    if tree is None:
+        return
+    postfix = _outcome(pda.infix_to_postfix, expr)
+    if postfix != reference_postfix(tree):
+        report.fail('infix_to_postfix', expr, reference_postfix(tree), postfix)
+    elif reference_evaluate(postfix) != tree:
+        report.fail('postfix round-trip', expr, tree, reference_evaluate(postfix))
+    elif not pda.recognize_postfix(postfix):
+        report.fail('recognize_postfix', postfix, True, False)
+
+
+def check_postfix(pda, postfix, report):
+    expected = reference_evaluate(postfix) is not None
+    got = pda.recognize_postfix(postfix)
+    if got != expected:
+        report.fail('recognize_postfix', postfix, expected, got)
+
+
+def check_same(candidate, baseline, expr, report):
+    """An optimized candidate must reproduce the baseline exactly, including on malformed input."""
+    for name in ('_tokenize', 'infix_to_postfix', 'recognize_infix', 'recognize_postfix'):
+        expected = _outcome(getattr(baseline, name), expr)
+        got = _outcome(getattr(candidate, name), expr)
+        if got != expected:
+            report.fail('{} (candidate)'.format(name), expr, expected, got)
+
+
+def fuzz(cases=2000, seed=0, pda=None, candidate=None, max_failures=20):
+    """Run `cases` rounds (one well-formed, one malformed and one postfix input each).
+
+    `pda` is checked against the reference implementations; when `candidate` is given
+    it is also compared output-for-output with `pda`. Stops after `max_failures` failures.
+    """
+    pda = pda or PDA()
+    gen = ExpressionGenerator(seed)
+    report = FuzzReport()
+    start = time.perf_counter()
+    for _ in range(cases):
+        well_formed = gen.well_formed()
+        malformed = gen.malformed()
+        postfix = gen.postfix()
+        check_infix(pda, well_formed, report)
+        check_infix(pda, malformed, report)
+        check_postfix(pda, postfix, report)
+        if candidate is not None:
+            for expr in (well_formed, malformed, postfix):
+                check_same(candidate, pda, expr, report)
+        report.cases += 3
+        if len(report.failures) >= max_failures:
+            break
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def _load(spec):
+    module, _, name = spec.partition(':')
+    return getattr(importlib.import_module(module), name or 'PDA')()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Differential fuzzing of the PDA converter and recognizers')
+    parser.add_argument('--cases', type=int, default=10000, help='Number of fuzz rounds (3 inputs each)')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed (default: random)')
+    parser.add_argument('--candidate', type=str, help='Optimized implementation to compare, as module:Class')
+    args = parser.parse_args(argv)
+
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    candidate = _load(args.candidate) if args.candidate else None
+    report = fuzz(args.cases, seed, candidate=candidate)
+    print('seed {}: {}'.format(seed, report))
+    for check, case, expected, got in report.failures:
+        print('  [{}] {!r}: expected {!r}, got {!r}'.format(check, case, expected, got))
+    return 1 if report.failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,176 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from PDA import PDA
+from ConversionCache import GRAMMAR_METHODS, ConversionCache, grammar_fingerprint
+
+
+class CountingPDA(PDA):
+    def __init__(self):
+        super().__init__()
+        self.conversions = 0
+
+    def infix_to_postfix(self, expr):
+        self.conversions += 1
+        return super().infix_to_postfix(expr)
+
+
+@pytest.fixture()
+def db_path(tmp_path):
+    return str(tmp_path / 'conversions.sqlite')
+
+
+def test_convert_many_matches_pda(db_path):
+    pda = PDA()
+    exprs = ['(a+b)*c', '-3+4', '((a+b)*c', 'sin(x)+cos(y)', 'a+']
+    with ConversionCache(db_path) as cache:
+        results = cache.convert_many(exprs)
+    for expr, (postfix, verdict) in zip(exprs, results):
+        assert verdict == pda.recognize_infix(expr)
+        if postfix is not None:
+            assert postfix == pda.infix_to_postfix(expr)
+    assert results[2] == (None, False)
+
+
+def test_warm_run_skips_parsing(db_path):
+    exprs = ['(a+b)*c', '-5*(3+2)', '(a+b)^2']
+    with ConversionCache(db_path, pda=CountingPDA()) as cache:
+        cold = cache.convert_many(exprs)
+        assert cache.pda.conversions == 3
+
+    pda = CountingPDA()
+    with ConversionCache(db_path, pda=pda) as cache:
+        assert cache.convert_many(exprs) == cold
+        assert pda.conversions == 0
+        cache.convert_many(exprs + ['x*y'])
+        assert pda.conversions == 1
+
+
+def test_grammar_change_invalidates(db_path):
+    class NewGrammarPDA(PDA):
+        GRAMMAR_VERSION = PDA.GRAMMAR_VERSION + 1
+
+    with ConversionCache(db_path) as cache:
+        cache.convert_many(['a+b', 'a*b'])
+        assert len(cache) == 2
+    with ConversionCache(db_path, pda=NewGrammarPDA()) as cache:
+        assert len(cache) == 0
+
+
+def test_size_based_eviction(db_path):
+    with ConversionCache(db_path, max_entries=3, batch_size=2) as cache:
+        cache.convert_many(['a+b', 'a-b', 'a*b', 'a/b', 'a^b'])
+        assert len(cache) == 3
+        assert set(cache.get_many(['a*b', 'a/b', 'a^b'])) == {'a*b', 'a/b', 'a^b'}
+
+
+def test_postfix_tokenizer_change_invalidates(db_path):
+    class NewTokenizerPDA(PDA):
+        GRAMMAR_VERSION = PDA.GRAMMAR_VERSION
+
+        def _tokenize_postfix(self, expr):
+            return expr.split()
+
+    with ConversionCache(db_path) as cache:
+        cache.convert_many(['a+b', 'a*-3'])
+        assert len(cache) == 2
+    with ConversionCache(db_path, pda=NewTokenizerPDA()) as cache:
+        assert len(cache) == 0
+
+
+def test_instrumentation_and_unrelated_changes_keep_the_store(db_path):
+    class OtherHelpersPDA(PDA):
+        GRAMMAR_VERSION = PDA.GRAMMAR_VERSION
+
+        def recognize_batch(self, exprs, postfix=False, max_workers=None, chunk_size=256):
+            """Not part of the grammar."""
+            return [self.recognize_infix(e) for e in exprs]
+
+    with ConversionCache(db_path) as cache:
+        cache.convert_many(['a+b', 'a*-3'])
+    with ConversionCache(db_path, pda=CountingPDA()) as cache:
+        assert len(cache) == 2
+    with ConversionCache(db_path, pda=OtherHelpersPDA()) as cache:
+        assert len(cache) == 2
+
+
+def called_methods(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if hasattr(const, 'co_names'):
+            names |= called_methods(const)
+    return {name for name in names if callable(getattr(PDA, name, None))}
+
+
+def test_grammar_methods_cover_their_helpers():
+    # a grammar method calling a PDA helper outside GRAMMAR_METHODS would let edits to it go unnoticed
+    for name in GRAMMAR_METHODS:
+        assert called_methods(getattr(PDA, name).__code__) <= set(GRAMMAR_METHODS), name
+
+
+def test_eviction_does_not_count_every_batch(db_path):
+    with ConversionCache(db_path, max_entries=100, batch_size=2) as cache:
+        counts = []
+        cache.conn.set_trace_callback(lambda sql: counts.append(sql) if 'COUNT' in sql else None)
+        cache.convert_many(['a+{}'.format(i) for i in range(40)])
+        assert counts == []
+        cache.convert_many(['b+{}'.format(i) for i in range(80)])
+        cache.put_many([('b+1', 'b 1 +', True), ('c', 'c', True)])
+        cache.conn.set_trace_callback(None)
+        assert counts == []
+        assert len(cache) == 100
+
+
+def used_generation(cache, expr):
+    from ConversionCache import expression_key
+    return cache.conn.execute('SELECT used FROM conversions WHERE key = ?', (expression_key(expr),)).fetchone()[0]
+
+
+def test_recency_is_tracked_per_run(db_path):
+    with ConversionCache(db_path, max_entries=3, touch_interval=1) as cache:
+        cache.convert_many(['a+b', 'a-b', 'a*b'])
+    with ConversionCache(db_path, max_entries=3, touch_interval=1) as cache:
+        cache.get_many(['a+b'])
+        assert used_generation(cache, 'a+b') == cache.generation
+        cache.convert_many(['a/b'])
+        assert set(cache.get_many(['a+b', 'a-b', 'a*b', 'a/b'])) == {'a+b', 'a*b', 'a/b'}
+
+
+def test_recent_hits_are_not_rewritten(db_path):
+    with ConversionCache(db_path, max_entries=10) as cache:
+        cache.convert_many(['a+b'])
+        first = cache.generation
+    with ConversionCache(db_path, max_entries=10, touch_interval=8) as cache:
+        assert cache.get_many(['a+b'])
+        assert used_generation(cache, 'a+b') == first
+
+
+def test_convert_iter_streams_in_order(db_path):
+    exprs = ['(a+b)*c', '-3+4', '((a+b)*c', 'a+', '(a+b)*c']
+    with ConversionCache(db_path) as cache:
+        streamed = list(cache.convert_iter(iter(exprs), chunk_size=2))
+        assert [expr for expr, _, _ in streamed] == exprs
+        assert [(postfix, verdict) for _, postfix, verdict in streamed] == cache.convert_many(exprs)
+
+
+FALLBACK_FINGERPRINT = """
+import inspect
+def no_source(obj):
+    raise OSError('no source')
+inspect.getsource = no_source
+from ConversionCache import grammar_fingerprint
+print(grammar_fingerprint())
+"""
+
+
+def test_fingerprint_without_source_is_stable():
+    # pyc-only/frozen installs: two processes (different hash seeds) must agree
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digests = set()
+    for seed in ('1', '2'):
+        proc = subprocess.run([sys.executable, '-c', FALLBACK_FINGERPRINT], cwd=root, capture_output=True,
+                              text=True, check=True, env=dict(os.environ, PYTHONHASHSEED=seed))
+        digests.add(proc.stdout.strip())
+    assert len(digests) == 1
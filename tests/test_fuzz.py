@@ -0,0 +1,38 @@
+import pytest
+from PDA import PDA
+from fuzz_pda import (ExpressionGenerator, fuzz, reference_evaluate, reference_parse,
+                      reference_postfix, reference_recognize)
+
+
+def test_reference_parser():
+    assert reference_parse('(a+b)*c') == ('*', ('+', 'a', 'b'), 'c')
+    assert reference_parse('-2^2') == ('^', '-2', '2')
+    assert reference_parse('a^b^c') == ('^', 'a', ('^', 'b', 'c'))
+    assert reference_postfix(reference_parse('-sin(x)+4')) == 'x sin u- 4 +'
+    assert reference_recognize('sin x') is False
+    assert reference_evaluate('a b + c *') == ('*', ('+', 'a', 'b'), 'c')
+    assert reference_evaluate('a +') is None
+
+
+def test_generator_is_deterministic():
+    first, second = ExpressionGenerator(7), ExpressionGenerator(7)
+    assert [first.malformed() for _ in range(20)] == [second.malformed() for _ in range(20)]
+    assert all(reference_recognize(first.well_formed()) for _ in range(200))
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_pda_agrees_with_reference(seed):
+    report = fuzz(cases=700, seed=seed)
+    assert report.failures == []
+
+
+def test_candidate_must_match_baseline():
+    assert fuzz(cases=200, seed=3, candidate=PDA()).failures == []
+
+    class Reordered(PDA):
+        def infix_to_postfix(self, expr):
+            return ' '.join(reversed(super().infix_to_postfix(expr).split()))
+
+    report = fuzz(cases=200, seed=3, candidate=Reordered())
+    assert report.failures
+    assert report.failures[0][0] == 'infix_to_postfix (candidate)'
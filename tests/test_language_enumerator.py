@@ -0,0 +1,121 @@
+import itertools
+
+import pytest
+from FileHandler import FileHandler
+from LanguageEnumerator import LanguageEnumerator
+from PDA import PDA, main
+
+# pushes A for each 'a', pops one for each 'b'; the end marker accepts only on an empty stack
+ANBN = """q p f
+a b
+Z A
+q
+Z
+f
+q a Z q A
+q a A q A
+q b A p e
+p b A p e
+p e Z f e
+"""
+
+
+@pytest.fixture()
+def parsed(tmp_path):
+    path = tmp_path / 'anbn.txt'
+    path.write_text(ANBN)
+    fh = FileHandler()
+    return fh.parseFile(fh.readFile(str(path)))
+
+
+def all_strings(alphabet, max_length):
+    for length in range(max_length + 1):
+        for combo in itertools.product(alphabet, repeat=length):
+            yield ''.join(combo)
+
+
+def test_accepts_matches_compute_legacy(parsed, capsys):
+    pda = PDA()
+    enumerator = LanguageEnumerator(parsed)
+    for word in all_strings('ab', 4):
+        assert enumerator.accepts(word) == pda.compute_legacy(word, parsed)
+    capsys.readouterr()
+
+
+def test_enumerate_matches_brute_force(parsed):
+    enumerator = LanguageEnumerator(parsed)
+    expected = [w for w in all_strings('ab', 6) if enumerator.accepts(w)]
+    assert list(enumerator.enumerate(6)) == expected
+    assert enumerator.stats.accepted == len(expected)
+    assert enumerator.stats.explored > 0
+
+
+def test_shortest_witness(parsed):
+    enumerator = LanguageEnumerator(parsed)
+    assert enumerator.shortest_witness() == 'ab'
+    assert enumerator.shortest_witness(max_length=1) is None
+
+
+def test_stack_depth_limit_prunes(parsed):
+    enumerator = LanguageEnumerator(parsed, max_stack_depth=2)
+    words = list(enumerator.enumerate(6))
+    assert 'ab' in words
+    assert 'aabb' not in words
+    assert enumerator.stats.pruned > 0
+
+
+def test_limits_stop_early(parsed):
+    enumerator = LanguageEnumerator(parsed)
+    assert len(list(enumerator.enumerate(10, limit=3))) == 3
+    assert enumerator.stats.stopped == 'limit'
+
+    enumerator = LanguageEnumerator(parsed, max_explored=10)
+    list(enumerator.enumerate(10))
+    assert enumerator.stats.explored == 10
+    assert enumerator.stats.stopped == 'max_explored'
+
+
+def test_long_bounds_do_not_recurse():
+    # accepts every a^n; far longer than the interpreter's recursion limit
+    parsed = {'input_symbols': ['a'], 'final_states': ['f'], 'initial_state': 'q', 'initial_stack': 'Z',
+              'productions': [['q', 'a', 'Z', 'q', 'e'], ['q', 'e', 'Z', 'f', 'e']]}
+    enumerator = LanguageEnumerator(parsed)
+    words = list(enumerator.enumerate(3000))
+    assert len(words) == 3001
+    assert words[-1] == 'a' * 3000
+
+
+def test_frontier_cap_finishes_the_level(parsed):
+    enumerator = LanguageEnumerator(parsed, max_frontier=10)
+    words = list(enumerator.enumerate(8))
+    assert enumerator.stats.stopped == 'max_frontier'
+    expected = [w for w in all_strings('ab', 3) if enumerator.accepts(w)]
+    # levels 0..3 hold at most 8 prefixes each and are complete; level 4 would need 16
+    assert words == expected
+
+
+def test_cli_enumerate(parsed, tmp_path, capsys):
+    path = tmp_path / 'anbn.txt'
+    assert main(['--legacy', '--file', str(path), '--enumerate', '4']) == 0
+    words = list(LanguageEnumerator(parsed).enumerate(4))
+    assert capsys.readouterr().out.splitlines()[:len(words)] == words
+    assert main(['--legacy', '--file', str(path), '--shortest', '--limit', '100']) == 0
+    assert capsys.readouterr().out.splitlines()[0] == 'Shortest accepted string: ab'
+
+
+@pytest.mark.parametrize('argv', [
+    ['--infix', 'a+b', '--enumerate', '3'],
+    ['--postfix', 'a b +', '--shortest'],
+    ['--infix', 'a+b', '--limit', '10'],
+    ['--legacy', '--file', 'x.txt', '--limit', '10'],
+])
+def test_cli_rejects_enumeration_flags_out_of_mode(argv, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main(argv)
+    assert exc.value.code == 2
+    assert '--limit' in capsys.readouterr().err
+
+
+def test_cli_enumerate_without_file(capsys):
+    assert main(['--legacy', '--enumerate', '3']) == 2
+    assert capsys.readouterr().out == 'Error: --legacy --enumerate/--shortest requires --file PATH\n'
@@ -80,3 +80,29 @@ def test_negative_in_expression(pda):
     postfix = pda.infix_to_postfix('-5*(3+2)')
     assert postfix == '-5 3 2 + *'
     assert pda.recognize_postfix(postfix) is True
+
+
+def test_negative_literal_after_operator(pda):
+    # a*-3 -> a -3 * ('-3' follows an operand in postfix, still a literal)
+    postfix = pda.infix_to_postfix('a*-3')
+    assert postfix == 'a -3 *'
+    assert pda.recognize_postfix(postfix) is True
+    assert pda.recognize_infix('2^-1') is True
+
+
+def test_function_requires_parentheses(pda):
+    for expr in ('sin x', 'x sin', 'sin'):
+        with pytest.raises(ValueError):
+            pda.infix_to_postfix(expr)
+        assert pda.recognize_infix(expr) is False
+
+
+def test_infix_rejects_postfix_order(pda):
+    # a b + is postfix, not infix
+    assert pda.recognize_infix('a b +') is False
+    assert pda.recognize_infix('+ a b') is False
+
+
+def test_unknown_symbols_rejected(pda):
+    assert pda.recognize_infix('a+%') is False
+    assert pda.recognize_postfix('%') is False
@@ -0,0 +1,52 @@
+import compileall
+import subprocess
+import sys
+
+import pytest
+import PDA as pda_module
+from bench_startup import HERE, IMPORT_BUDGET, import_times, module_import_us, startup_import_us
+
+
+@pytest.fixture(scope='module')
+def baseline_us():
+    # warm starts only: a stale .pyc would add recompilation to the measured import
+    compileall.compile_dir(HERE, maxlevels=0, quiet=1)
+    return startup_import_us()
+
+
+@pytest.mark.parametrize('module', sorted(IMPORT_BUDGET))
+def test_import_within_budget(module, baseline_us):
+    cumulative = module_import_us(module)
+    assert cumulative <= baseline_us * IMPORT_BUDGET[module], (module, cumulative, baseline_us)
+
+
+@pytest.mark.parametrize('module', ['PDA', 'InfixChecker', 'PostfixChecker'])
+def test_no_eager_heavy_imports(module):
+    times = import_times(module)
+    for heavy in ('argparse', 'FileHandler', 'threading', 'concurrent.futures', 'sqlite3'):
+        assert heavy not in {name.strip() for name in times}
+
+
+def test_fast_path_postfix(capsys):
+    assert pda_module.main(['--postfix', 'a b + c *']) == 0
+    assert pda_module.main(['--postfix=a +']) == 1
+    assert 'TỪ CHỐI' in capsys.readouterr().out
+
+
+def test_fast_path_infix(capsys):
+    assert pda_module.main(['--infix', '-3+4']) == 0
+    assert 'Converted postfix: -3 4 +' in capsys.readouterr().out
+    assert pda_module.main(['--infix', '((a+b)*c']) == 1
+
+
+def test_other_commands_fall_back_to_argparse():
+    assert pda_module._fast_main(['--postfix', 'a b +', '--file', 'x']) is None
+    assert pda_module._fast_main(['--legacy']) is None
+    with pytest.raises(SystemExit):
+        pda_module.main(['--postfix', '--infix'])
+
+
+@pytest.mark.parametrize('expr, status', [('a b +', 0), ('a +', 1)])
+def test_script_exit_status(expr, status):
+    proc = subprocess.run([sys.executable, 'PDA.py', '--postfix', expr], cwd=HERE, capture_output=True)
+    assert proc.returncode == status
@@ -0,0 +1,109 @@
+import io
+import threading
+import time
+
+import pytest
+
+from PDA import PDA
+from InfixChecker import InfixChecker
+from PostfixChecker import PostfixChecker
+
+EXPRS = ['(a+b)*c', '-3+4', '((a+b)*c', 'sin(x)+cos(y)', 'a+', '(a+b)^2', '3.14*2', '-5*(3+2)']
+THREADS = 16
+ROUNDS = 50
+
+
+def run_threads(target):
+    barrier = threading.Barrier(THREADS)
+    errors = []
+
+    def worker(n):
+        try:
+            barrier.wait()
+            target(n)
+        except Exception as e:  # pragma: no cover - surfaced by the assert below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+
+
+def convert(pda, expr):
+    try:
+        return pda.infix_to_postfix(expr), pda.recognize_infix(expr)
+    except ValueError:
+        return None, pda.recognize_infix(expr)
+
+
+def test_shared_pda_stress():
+    pda = PDA()
+    expected = {expr: convert(pda, expr) for expr in EXPRS}
+    mismatches = []
+
+    def target(n):
+        for i in range(ROUNDS):
+            expr = EXPRS[(n + i) % len(EXPRS)]
+            got = convert(pda, expr)
+            if got != expected[expr]:
+                mismatches.append((expr, got))
+
+    run_threads(target)
+    assert mismatches == []
+
+
+def test_recognize_batch_matches_serial():
+    pda = PDA()
+    exprs = EXPRS * 200
+    assert pda.recognize_batch(exprs, max_workers=8, chunk_size=64) == [pda.recognize_infix(e) for e in exprs]
+    postfix = ['a b +', '3 +', 'x sin', 'a b'] * 100
+    assert pda.recognize_batch(postfix, postfix=True) == [pda.recognize_postfix(e) for e in postfix]
+    assert pda.recognize_batch([]) == []
+
+
+def report_blocks(text):
+    end = '=' * 70 + '\n\n'
+    return sorted(block + end for block in text.split(end) if block)
+
+
+class YieldingStream(io.StringIO):
+    """A stream whose write() gives other threads a chance to run halfway through."""
+
+    def write(self, text):
+        half = len(text) // 2
+        super().write(text[:half])
+        time.sleep(0.0005)
+        return half + super().write(text[half:])
+
+
+def test_shared_checkers_do_not_interleave_output():
+    infix_exprs = EXPRS
+    postfix_exprs = ['a b +', '3 +', 'x sin', 'a b']
+    serial = io.StringIO()
+    for expr in infix_exprs:
+        InfixChecker(out=serial).check_infix(expr)
+    for expr in postfix_exprs:
+        PostfixChecker(out=serial).check_postfix(expr)
+
+    # an InfixChecker and a PostfixChecker share one stream; the lock must serialize both
+    out = YieldingStream()
+    infix_checker = InfixChecker(out=out)
+    postfix_checker = PostfixChecker(out=out)
+
+    def target(n):
+        for expr in infix_exprs:
+            infix_checker.check_infix(expr)
+        for expr in postfix_exprs:
+            postfix_checker.check_postfix(expr)
+
+    run_threads(target)
+    assert report_blocks(out.getvalue()) == sorted(report_blocks(serial.getvalue()) * THREADS)
+
+
+def test_recognize_batch_rejects_bad_chunk_size():
+    for chunk_size in (0, -1):
+        with pytest.raises(ValueError, match='chunk_size'):
+            PDA().recognize_batch(['a+b'], chunk_size=chunk_size)